@@ -2,29 +2,57 @@
 from flask import Flask
 from flask_cors import CORS
 import os
-import json
-from models import init_db
+from models import create_schema, DEFAULT_DB_URL
+from scoring import prediction_cache, DEFAULT_CACHE_SIZE
 from routes.product_routes import product_bp
 from routes.contractor_routes import contractor_bp
 from routes.notification_routes import notification_bp
 from routes.db_init_routes import db_init_bp
+from routes.sync_routes import sync_bp
+from routes.admin_routes import admin_bp
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for all routes
+def create_app(config=None):
+    """
+    Create the Flask application.
 
-# Initialize database
-DB_PATH = 'sqlite:///data.db'
-engine = init_db(DB_PATH)
+    No database connection is made here: each process creates an engine for
+    the app's ``DATABASE_URL`` on first use, so workers start fast and stay
+    fork-safe, and several apps in one process keep their own databases.
+    Run ``flask --app app init-db`` once to create the schema.
+    """
+    app = Flask(__name__)
+    app.config['DATABASE_URL'] = os.environ.get('DATABASE_URL', DEFAULT_DB_URL)
+    app.config['PREDICTION_CACHE_SIZE'] = int(os.environ.get('PREDICTION_CACHE_SIZE', DEFAULT_CACHE_SIZE))
+    if config:
+        app.config.update(config)
 
-# Register blueprints
-app.register_blueprint(product_bp, url_prefix='/api')
-app.register_blueprint(contractor_bp, url_prefix='/api')
-app.register_blueprint(notification_bp, url_prefix='/api')
-app.register_blueprint(db_init_bp, url_prefix='/api')
+    CORS(app)  # Enable CORS for all routes
+
+    prediction_cache.resize(app.config['PREDICTION_CACHE_SIZE'])
+
+    # Register blueprints
+    app.register_blueprint(product_bp, url_prefix='/api')
+    app.register_blueprint(contractor_bp, url_prefix='/api')
+    app.register_blueprint(notification_bp, url_prefix='/api')
+    app.register_blueprint(db_init_bp, url_prefix='/api')
+    app.register_blueprint(sync_bp, url_prefix='/api')
+    app.register_blueprint(admin_bp, url_prefix='/api')
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create the database schema"""
+        create_schema()
+        print(f"Initialized schema for {app.config['DATABASE_URL']}")
+
+    return app
 
 if __name__ == '__main__':
     # Create data directory if it doesn't exist (for SQLite database)
     os.makedirs('data', exist_ok=True)
-    
+
+    app = create_app()
+    with app.app_context():
+        create_schema()
+
     # Start the server
     app.run(debug=True, port=5000)
@@ -0,0 +1,45 @@
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Timed inside a fresh interpreter so each run is a cold worker boot
+BOOT_SCRIPT = """
+import time
+started = time.perf_counter()
+from app import create_app
+app = create_app({'DATABASE_URL': %(db_url)r})
+booted = time.perf_counter()
+app.test_client().get('/api/products')
+served = time.perf_counter()
+print(booted - started, served - started)
+"""
+
+def measure(db_url, runs):
+    """Boot the app ``runs`` times and return (boot_seconds, first_request_seconds) lists"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    boot_times = []
+    first_request_times = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', BOOT_SCRIPT % {'db_url': db_url}],
+            cwd=here, check=True, capture_output=True, text=True
+        ).stdout.split()
+        boot_times.append(float(output[0]))
+        first_request_times.append(float(output[1]))
+    return boot_times, first_request_times
+
+def report(label, times):
+    print(f"{label}: min {min(times) * 1000:.1f} ms, median {statistics.median(times) * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure cold application startup time')
+    parser.add_argument('--db', default='sqlite:///data.db', help='Database URL (schema must already exist)')
+    parser.add_argument('--runs', type=int, default=10, help='Number of cold boots')
+    args = parser.parse_args()
+
+    boot_times, first_request_times = measure(args.db, args.runs)
+    report('create_app', boot_times)
+    report('first request', first_request_times)
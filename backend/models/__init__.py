@@ -1,19 +1,23 @@
 
 from .base import Base, Session, init_db, get_session
+from .base import configure_db, get_engine, create_schema, DEFAULT_DB_URL, BULK_CHUNK_SIZE
 from .enums import ProductType, MaintenanceType, HealthStatus, NotificationType
 from .person import Person
 from .contractor import Contractor
 from .product import Product
 from .maintenance import MaintenanceRecord, MaintenanceRecommendation
 from .notification import Notification
+from .change_log import ChangeLog, record_change, record_changes, record_changes_from, current_token, entity_version
 from .associations import contractor_installer, contractor_homeowner, notification_recipient
 
 # Re-export everything for backwards compatibility
 __all__ = [
     'Base', 'Session', 'init_db', 'get_session',
+    'configure_db', 'get_engine', 'create_schema', 'DEFAULT_DB_URL', 'BULK_CHUNK_SIZE',
     'ProductType', 'MaintenanceType', 'HealthStatus', 'NotificationType',
     'Person', 'Contractor', 'Product', 
     'MaintenanceRecord', 'MaintenanceRecommendation',
     'Notification',
+    'ChangeLog', 'record_change', 'record_changes', 'record_changes_from', 'current_token', 'entity_version',
     'contractor_installer', 'contractor_homeowner', 'notification_recipient'
 ]
@@ -16,8 +16,10 @@ contractor_homeowner = Table(
     Column('homeowner_id', String, ForeignKey('persons.id'))
 )
 
+# Indexed both ways: bulk dismissal and retention delete by notification_id,
+# recipient filters look up by person_id
 notification_recipient = Table(
     'notification_recipient', Base.metadata,
-    Column('notification_id', String, ForeignKey('notifications.id')),
-    Column('person_id', String, ForeignKey('persons.id'))
+    Column('notification_id', String, ForeignKey('notifications.id'), index=True),
+    Column('person_id', String, ForeignKey('persons.id'), index=True)
 )
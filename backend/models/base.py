@@ -1,21 +1,91 @@
 
+import os
+import threading
+from flask import current_app, has_app_context
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 Base = declarative_base()
 
-# Global Session variable
-Session = None
+DEFAULT_DB_URL = 'sqlite:///data.db'
 
-def init_db(db_path='sqlite:///data.db'):
-    """Initialize the database and return the engine"""
-    global Session
-    engine = create_engine(db_path)
+# Keep IN (...) lists below SQLite's bound parameter limit
+BULK_CHUNK_SIZE = 500
+
+# Database used outside an app context (CLI scripts, worker processes)
+_db_url = DEFAULT_DB_URL
+# Per-process engines keyed by database URL, filled in lazily by get_engine()
+_engines = {}
+_engines_pid = None
+# Guards _engines so concurrent first requests in threaded workers share one engine
+_engines_lock = threading.Lock()
+
+class LazySessionMaker(sessionmaker):
+    """A sessionmaker that binds to the current process's engine when a session is opened"""
+
+    def __call__(self, **local_kw):
+        local_kw.setdefault('bind', get_engine())
+        return super().__call__(**local_kw)
+
+# Global Session factory; safe to import before the database is configured
+Session = LazySessionMaker()
+
+def configure_db(db_url=DEFAULT_DB_URL):
+    """Set the database URL used outside an app context; no connection is made"""
+    global _db_url
+    _db_url = db_url
+
+def get_engine(db_url=None):
+    """
+    Return this process's engine for ``db_url``, creating it on first use.
+
+    Without a URL the current app's ``DATABASE_URL`` is used, falling back to
+    the one set by configure_db() outside an app context. Engines inherited
+    across a fork are discarded and rebuilt in the child.
+    """
+    global _engines, _engines_pid
+    if db_url is None:
+        db_url = current_app.config['DATABASE_URL'] if has_app_context() else _db_url
+
+    pid = os.getpid()
+    if _engines_pid == pid:
+        engine = _engines.get(db_url)
+        if engine is not None:
+            return engine
+
+    with _engines_lock:
+        if _engines_pid != pid:
+            for engine in _engines.values():
+                # Inherited from the parent: drop its pooled connections without closing them
+                engine.dispose(close=False)
+            _engines = {}
+            _engines_pid = pid
+
+        engine = _engines.get(db_url)
+        if engine is None:
+            engine = _engines[db_url] = create_engine(db_url)
+        return engine
+
+def create_schema(engine=None):
+    """
+    Create all tables and indexes; run once at deploy time rather than on every startup.
+
+    create_all skips tables that already exist, so indexes added to an existing
+    table are created separately. Re-running this upgrades older databases.
+    """
+    engine = engine or get_engine()
     Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
     return engine
 
+def init_db(db_path=DEFAULT_DB_URL):
+    """Initialize the database and return the engine"""
+    configure_db(db_path)
+    return create_schema()
+
 def get_session(engine):
     """Get a session for the database"""
     session_maker = sessionmaker(bind=engine)
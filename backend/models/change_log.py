@@ -0,0 +1,89 @@
+
+from sqlalchemy import Column, String, Integer, DateTime, Index, bindparam, func, insert, literal, select
+from datetime import datetime
+from .base import Base
+
+class ChangeLog(Base):
+    __tablename__ = 'change_log'
+    # AUTOINCREMENT keeps ids monotonic after compaction so they can serve as sync
+    # tokens; ids only commit in order because SQLite serializes writers
+    __table_args__ = (
+        # Back entity_version(): latest entry per row and latest reset are index lookups
+        Index('ix_change_log_entity_row', 'entity', 'entity_id', 'id'),
+        Index('ix_change_log_op', 'op', 'id'),
+        {'sqlite_autoincrement': True},
+    )
+    
+    # Entity names as exposed by the sync API
+    PRODUCT = 'products'
+    MAINTENANCE_RECORD = 'maintenanceRecords'
+    NOTIFICATION = 'notifications'
+    ALL = '*'
+    
+    # Operations
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    RESET = 'reset'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    op = Column(String, nullable=False)
+    changed_at = Column(DateTime, default=datetime.now, nullable=False)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'entity': self.entity,
+            'entityId': self.entity_id,
+            'op': self.op,
+            'changedAt': self.changed_at.isoformat() if self.changed_at else None
+        }
+
+def record_change(session, entity, entity_id, op=ChangeLog.UPSERT):
+    """Append a change log entry in the caller's transaction"""
+    session.add(ChangeLog(entity=entity, entity_id=entity_id, op=op, changed_at=datetime.now()))
+
+def record_changes(session, entity, entity_ids, op=ChangeLog.UPSERT):
+    """Append change log entries for many ids with a single INSERT"""
+    now = datetime.now()
+    rows = [{'entity': entity, 'entity_id': entity_id, 'op': op, 'changed_at': now} for entity_id in entity_ids]
+    if rows:
+        session.execute(ChangeLog.__table__.insert(), rows)
+
+def record_changes_from(session, entity, id_select, op=ChangeLog.UPSERT):
+    """Append change log entries for every id returned by ``id_select`` using INSERT ... SELECT"""
+    ids = id_select.subquery()
+    rows = select(literal(entity), list(ids.c)[0], literal(op), literal(datetime.now()))
+    session.execute(insert(ChangeLog).from_select(['entity', 'entity_id', 'op', 'changed_at'], rows))
+
+# Built once on first use: constructing the statement costs several times
+# more than running it against the indexes
+_entity_version_statement = None
+
+def entity_version(connection, entity, entity_id):
+    """
+    Return a version for one row from the change log in a single indexed query.
+
+    The version changes whenever the row is logged as changed, a reset replaces
+    all data, or compaction trims the log (so a compacted entry can never make
+    an older version reappear). Only changes written through record_change*
+    are seen. ``connection`` may be a Connection or a Session.
+    """
+    global _entity_version_statement
+    if _entity_version_statement is None:
+        log = ChangeLog.__table__.c
+        latest = select(func.max(log.id)).where(
+            log.entity == bindparam('entity'),
+            log.entity_id == bindparam('entity_id')
+        ).scalar_subquery()
+        reset = select(func.max(log.id)).where(log.op == ChangeLog.RESET).scalar_subquery()
+        oldest = select(func.min(log.id)).scalar_subquery()
+        _entity_version_statement = select(latest, reset, oldest)
+    
+    params = {'entity': entity, 'entity_id': entity_id}
+    return tuple(connection.execute(_entity_version_statement, params).one())
+
+def current_token(session):
+    """Return the id of the newest change log entry, or 0 for an empty log"""
+    return session.query(func.max(ChangeLog.id)).scalar() or 0
@@ -0,0 +1,165 @@
+
+import argparse
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from sqlalchemy import create_engine, update
+from models import Product, MaintenanceRecommendation, ChangeLog, get_session, record_changes
+from models import get_engine, DEFAULT_DB_URL
+from utils import calculate_predictions, prediction_input
+
+DEFAULT_BATCH_SIZE = 200
+SHARD_STRATEGIES = ('contractor', 'range')
+
+def plan_shards(engine, strategy='contractor', shard_count=None):
+    """
+    Split the fleet into lists of product ids.
+
+    ``contractor`` groups products by contractor (products without one share a
+    group) and splits groups larger than an even share of ``shard_count`` into
+    sub-shards, so one big contractor still spreads across workers. ``range``
+    splits the ordered ids into ``shard_count`` even chunks.
+    """
+    if strategy not in SHARD_STRATEGIES:
+        raise ValueError(f"Unknown shard strategy: {strategy}")
+
+    session = get_session(engine)
+    try:
+        rows = session.query(Product.id, Product.contractor_id).order_by(Product.id).all()
+    finally:
+        session.close()
+
+    shard_count = max(1, shard_count or os.cpu_count() or 1)
+    size = max(1, -(-len(rows) // shard_count))
+
+    if strategy == 'contractor':
+        groups = defaultdict(list)
+        for product_id, contractor_id in rows:
+            groups[contractor_id].append(product_id)
+        return [
+            ids[start:start + size]
+            for ids in groups.values()
+            for start in range(0, len(ids), size)
+        ]
+
+    ids = [product_id for product_id, _ in rows]
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
+
+def recompute_shard(db_url, product_ids, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Recompute status and next maintenance for one shard of products.
+
+    Runs in a worker process with its own engine and writes the results back
+    in transactions of at most ``batch_size`` products. Only products whose
+    stored values differ are written and logged for delta sync. Returns
+    ``(products_seen, products_updated)``.
+    """
+    engine = create_engine(db_url)
+    session = get_session(engine)
+    seen = 0
+    updated = 0
+
+    try:
+        recommendations = defaultdict(list)
+        for recommendation in session.query(MaintenanceRecommendation):
+            recommendations[recommendation.product_type].append(recommendation.to_dict())
+
+        for start in range(0, len(product_ids), batch_size):
+            chunk = product_ids[start:start + batch_size]
+            products = session.query(Product).filter(Product.id.in_(chunk)).all()
+            changes = []
+
+            for product in products:
+                seen += 1
+                if product.install_date is None:
+                    continue
+                predictions = calculate_predictions(prediction_input(product), recommendations[product.type])
+                if 'hoursUntilMaintenance' not in predictions:
+                    continue
+                status = predictions['status']
+                hours_until_maintenance = predictions['hoursUntilMaintenance']
+                next_maintenance_date = datetime.fromisoformat(predictions['nextMaintenanceDate'])
+                if (product.status, product.hours_until_maintenance, product.next_maintenance_date) == \
+                        (status, hours_until_maintenance, next_maintenance_date):
+                    continue
+                changes.append({
+                    'id': product.id,
+                    'status': status,
+                    'hours_until_maintenance': hours_until_maintenance,
+                    'next_maintenance_date': next_maintenance_date
+                })
+
+            if changes:
+                session.execute(update(Product), changes)
+                record_changes(session, ChangeLog.PRODUCT, [change['id'] for change in changes])
+            session.commit()
+            session.expunge_all()
+            updated += len(changes)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+        engine.dispose()
+
+    return seen, updated
+
+def recompute_fleet(engine, strategy='contractor', workers=None, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """
+    Recompute every product across a process pool.
+
+    ``progress`` is called as ``progress(shards_done, shard_total, products_done, elapsed)``
+    after each shard finishes. Returns a summary dict.
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    shards = [shard for shard in plan_shards(engine, strategy, workers * 4) if shard]
+    db_url = engine.url.render_as_string(hide_password=False)
+
+    started = time.perf_counter()
+    seen = 0
+    updated = 0
+    # Never start more processes than there are shards
+    pool_size = min(workers, len(shards))
+
+    if shards:
+        # spawn keeps workers from inheriting the parent's open connections
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=pool_size, mp_context=context) as pool:
+            futures = [pool.submit(recompute_shard, db_url, shard, batch_size) for shard in shards]
+            for done, future in enumerate(as_completed(futures), start=1):
+                shard_seen, shard_updated = future.result()
+                seen += shard_seen
+                updated += shard_updated
+                if progress:
+                    progress(done, len(shards), seen, time.perf_counter() - started)
+
+    elapsed = time.perf_counter() - started
+    return {
+        'strategy': strategy,
+        'workers': pool_size,
+        'shards': len(shards),
+        'products': seen,
+        'updated': updated,
+        'seconds': round(elapsed, 3),
+        'productsPerSecond': round(seen / elapsed, 1) if elapsed > 0 else None
+    }
+
+def print_progress(shards_done, shard_total, products_done, elapsed):
+    rate = products_done / elapsed if elapsed > 0 else 0
+    print(f"[{shards_done}/{shard_total} shards] {products_done} products, {rate:.1f} products/s")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Recompute predictions and health status for the whole fleet')
+    parser.add_argument('--db', default=DEFAULT_DB_URL, help='Database URL')
+    parser.add_argument('--shard-by', choices=SHARD_STRATEGIES, default='contractor', help='How to split products across workers')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Products per write transaction')
+    args = parser.parse_args()
+
+    summary = recompute_fleet(get_engine(args.db), args.shard_by, args.workers, args.batch_size, print_progress)
+    print(f"Recomputed {summary['products']} products ({summary['updated']} updated) "
+          f"in {summary['seconds']}s with {summary['workers']} workers, "
+          f"{summary['productsPerSecond']} products/s")
@@ -0,0 +1,115 @@
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from models import (
+    ChangeLog, Notification, notification_recipient, record_changes,
+    get_engine, get_session, DEFAULT_DB_URL
+)
+
+DEFAULT_TTL_DAYS = 30
+DEFAULT_BATCH_SIZE = 200
+
+def purge_read_notifications(engine, ttl_days=DEFAULT_TTL_DAYS, batch_size=DEFAULT_BATCH_SIZE, pause=0.0):
+    """
+    Delete read notifications older than ``ttl_days``.
+
+    Work is split into transactions of at most ``batch_size`` notifications so
+    the write lock is only held briefly and request handlers can interleave.
+    Returns the total number of notifications removed.
+    """
+    cutoff = datetime.now() - timedelta(days=ttl_days)
+    session = get_session(engine)
+    total = 0
+
+    try:
+        while True:
+            ids = [
+                row.id for row in session.query(Notification.id)
+                .filter(Notification.read.is_(True), Notification.created_at < cutoff)
+                .limit(batch_size)
+            ]
+            if not ids:
+                break
+
+            session.execute(
+                notification_recipient.delete().where(
+                    notification_recipient.c.notification_id.in_(ids)
+                )
+            )
+            total += session.query(Notification).filter(
+                Notification.id.in_(ids)
+            ).delete(synchronize_session=False)
+            record_changes(session, ChangeLog.NOTIFICATION, ids, ChangeLog.DELETE)
+            session.commit()
+
+            if len(ids) < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    return total
+
+def compact_change_log(engine, ttl_days=DEFAULT_TTL_DAYS, batch_size=DEFAULT_BATCH_SIZE, pause=0.0):
+    """
+    Delete change log entries older than ``ttl_days`` in batched transactions.
+
+    The newest entry is always kept so the current sync token stays known;
+    clients holding a token older than the remaining log get a full resync.
+    Returns the total number of entries removed.
+    """
+    cutoff = datetime.now() - timedelta(days=ttl_days)
+    session = get_session(engine)
+    total = 0
+
+    try:
+        newest = session.query(func.max(ChangeLog.id)).scalar()
+        if newest is None:
+            return 0
+
+        while True:
+            ids = [
+                row.id for row in session.query(ChangeLog.id)
+                .filter(ChangeLog.changed_at < cutoff, ChangeLog.id < newest)
+                .order_by(ChangeLog.id)
+                .limit(batch_size)
+            ]
+            if not ids:
+                break
+
+            total += session.query(ChangeLog).filter(
+                ChangeLog.id.in_(ids)
+            ).delete(synchronize_session=False)
+            session.commit()
+
+            if len(ids) < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    return total
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Purge old read notifications and compact the change log')
+    parser.add_argument('--db', default=DEFAULT_DB_URL, help='Database URL')
+    parser.add_argument('--days', type=int, default=DEFAULT_TTL_DAYS, help='Retention period in days')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Notifications per transaction')
+    parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches')
+    args = parser.parse_args()
+
+    engine = get_engine(args.db)
+    purged = purge_read_notifications(engine, args.days, args.batch_size, args.pause)
+    print(f"Purged {purged} read notifications older than {args.days} days")
+    compacted = compact_change_log(engine, args.days, args.batch_size, args.pause)
+    print(f"Compacted {compacted} change log entries older than {args.days} days")
@@ -0,0 +1,59 @@
+import os
+from flask import Blueprint, current_app, jsonify, request
+from models import get_engine
+from scoring import prediction_cache
+
+admin_bp = Blueprint('admin_routes', __name__)
+
+def is_positive_int(value):
+    # bool is an int subclass; reject true/false explicitly
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+@admin_bp.route('/admin/recompute', methods=['POST'])
+def recompute_products():
+    """
+    Recompute predictions and health status for every product across a process pool.
+
+    The job runs synchronously inside the request, so large fleets can exceed
+    the server's worker timeout (30s by default under gunicorn); use
+    ``python recompute.py`` for those.
+    """
+    # Imported here: multiprocessing and concurrent.futures would otherwise
+    # add to every worker's startup for an endpoint that is rarely called
+    from recompute import recompute_fleet, SHARD_STRATEGIES, DEFAULT_BATCH_SIZE
+    
+    data = request.get_json(silent=True)
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    
+    strategy = data.get('shardBy', 'contractor')
+    if strategy not in SHARD_STRATEGIES:
+        return jsonify({"error": f"shardBy must be one of {', '.join(SHARD_STRATEGIES)}"}), 400
+    
+    max_workers = os.cpu_count() or 1
+    workers = data.get('workers', max_workers)
+    if not is_positive_int(workers):
+        return jsonify({"error": "workers must be a positive integer"}), 400
+    
+    batch_size = data.get('batchSize', DEFAULT_BATCH_SIZE)
+    if not is_positive_int(batch_size):
+        return jsonify({"error": "batchSize must be a positive integer"}), 400
+    
+    try:
+        summary = recompute_fleet(
+            get_engine(),
+            strategy=strategy,
+            workers=min(workers, max_workers),
+            batch_size=batch_size
+        )
+        return jsonify({"message": "Fleet recomputed successfully", "summary": summary})
+    except Exception:
+        current_app.logger.exception("Fleet recompute failed")
+        return jsonify({"error": "Fleet recompute failed"}), 500
+
+@admin_bp.route('/admin/prediction-cache', methods=['GET'])
+def get_prediction_cache_stats():
+    """Report size, hits, misses and evictions of this process's prediction cache"""
+    return jsonify(prediction_cache.stats())
@@ -1,7 +1,7 @@
 from flask import Blueprint, jsonify, request
 from datetime import datetime
 import uuid
-from models import Contractor, Product, Notification, Session
+from models import Contractor, Product, Notification, Session, ChangeLog, record_change
 
 contractor_bp = Blueprint('contractor_routes', __name__)
 
@@ -78,6 +78,7 @@ def send_notification(contractor_id):
         notification.recipients.append(recipient)
     
     session.add(notification)
+    record_change(session, ChangeLog.NOTIFICATION, notification.id)
     session.commit()
     
     result = notification.to_dict()
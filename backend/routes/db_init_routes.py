@@ -2,6 +2,7 @@ from flask import Blueprint, jsonify, request
 from datetime import datetime
 import json
 from models import Session, Product, MaintenanceRecord, MaintenanceRecommendation, Person, Contractor, Notification
+from models import ChangeLog, record_change
 
 db_init_bp = Blueprint('db_init_routes', __name__)
 
@@ -112,6 +113,9 @@ def initialize_data():
             if person:
                 notification.recipients.append(person)
     
+    # Every synced collection was replaced, so clients must do a full resync
+    record_change(session, ChangeLog.ALL, ChangeLog.ALL, ChangeLog.RESET)
+    
     session.commit()
     session.close()
     
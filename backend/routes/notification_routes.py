@@ -1,9 +1,16 @@
 
-from flask import Blueprint, jsonify, request
-from models import Notification, Person, Session
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import select
+from models import Notification, Person, Session, notification_recipient
+from models import ChangeLog, record_change, record_changes, record_changes_from, BULK_CHUNK_SIZE
 
 notification_bp = Blueprint('notification_routes', __name__)
 
+# Caller-supplied ids are bound in a single IN (...), so cap them at one chunk
+MAX_BULK_IDS = BULK_CHUNK_SIZE
+
+BULK_STRING_FILTERS = ('recipientId', 'productId', 'type')
+
 @notification_bp.route('/notifications', methods=['GET'])
 def get_notifications():
     session = Session()
@@ -27,6 +34,114 @@ def get_notifications():
     finally:
         session.close()
 
+def validate_bulk_request(data):
+    """Return an error message for a malformed bulk request body, or None if it is valid"""
+    if not isinstance(data, dict):
+        return "Request body must be a JSON object"
+
+    ids = data.get('ids')
+    if ids is not None:
+        if not isinstance(ids, list) or not all(isinstance(notification_id, str) for notification_id in ids):
+            return "ids must be a list of strings"
+        if len(ids) > MAX_BULK_IDS:
+            return f"ids must contain at most {MAX_BULK_IDS} entries"
+
+    for name in BULK_STRING_FILTERS:
+        if data.get(name) is not None and not isinstance(data[name], str):
+            return f"{name} must be a string"
+
+    if data.get('read') is not None and not isinstance(data['read'], bool):
+        return "read must be true or false"
+
+    if ids is None and not any(data.get(name) for name in BULK_STRING_FILTERS) and data.get('read') is None:
+        return "Provide ids or at least one filter"
+    return None
+
+def build_bulk_query(session, data):
+    """Build a notification query from a validated bulk request body.
+
+    Accepts an explicit ``ids`` list and/or the ``recipientId``, ``productId``,
+    ``type`` and ``read`` filters; see validate_bulk_request.
+    """
+    filters = []
+    if data.get('ids') is not None:
+        filters.append(Notification.id.in_(data['ids']))
+    if data.get('recipientId'):
+        filters.append(Notification.id.in_(
+            select(notification_recipient.c.notification_id).where(
+                notification_recipient.c.person_id == data['recipientId']
+            )
+        ))
+    if data.get('productId'):
+        filters.append(Notification.product_id == data['productId'])
+    if data.get('type'):
+        filters.append(Notification.type == data['type'])
+    if data.get('read') is not None:
+        filters.append(Notification.read == data['read'])
+
+    return session.query(Notification).filter(*filters)
+
+@notification_bp.route('/notifications/read', methods=['PUT'])
+def mark_notifications_as_read():
+    """Mark every notification matching the ids/filters as read in one UPDATE"""
+    data = request.get_json(silent=True)
+    error = validate_bulk_request(data)
+    if error:
+        return jsonify({"error": error}), 400
+    
+    session = Session()
+    
+    try:
+        query = build_bulk_query(session, data)
+        unread = query.filter(Notification.read.isnot(True))
+        record_changes_from(session, ChangeLog.NOTIFICATION, unread.with_entities(Notification.id).statement)
+        updated = unread.update({Notification.read: True}, synchronize_session=False)
+        session.commit()
+        return jsonify({"message": "Notifications marked as read", "updated": updated})
+    except Exception:
+        session.rollback()
+        current_app.logger.exception("Bulk mark as read failed")
+        return jsonify({"error": "Failed to mark notifications as read"}), 500
+    finally:
+        session.close()
+
+@notification_bp.route('/notifications', methods=['DELETE'])
+def dismiss_notifications():
+    """Dismiss every notification matching the ids/filters in one transaction"""
+    data = request.get_json(silent=True)
+    error = validate_bulk_request(data)
+    if error:
+        return jsonify({"error": error}), 400
+    
+    session = Session()
+    
+    try:
+        query = build_bulk_query(session, data)
+        
+        # Resolve the ids up front: the recipientId filter reads the
+        # association table, which is cleared before the notifications
+        ids = [row.id for row in query.with_entities(Notification.id)]
+        deleted = 0
+        for start in range(0, len(ids), BULK_CHUNK_SIZE):
+            chunk = ids[start:start + BULK_CHUNK_SIZE]
+            session.execute(
+                notification_recipient.delete().where(
+                    notification_recipient.c.notification_id.in_(chunk)
+                )
+            )
+            deleted += session.query(Notification).filter(
+                Notification.id.in_(chunk)
+            ).delete(synchronize_session=False)
+            record_changes(session, ChangeLog.NOTIFICATION, chunk, ChangeLog.DELETE)
+        session.commit()
+        return jsonify({"message": "Notifications dismissed successfully", "deleted": deleted})
+    except Exception:
+        session.rollback()
+        current_app.logger.exception("Bulk dismiss failed")
+        return jsonify({"error": "Failed to dismiss notifications"}), 500
+    finally:
+        session.close()
+
 @notification_bp.route('/notifications/<notification_id>/read', methods=['PUT'])
 def mark_notification_as_read(notification_id):
     session = Session()
@@ -36,6 +151,7 @@ def mark_notification_as_read(notification_id):
         
         if notification:
             notification.read = True
+            record_change(session, ChangeLog.NOTIFICATION, notification.id)
             session.commit()
             return jsonify({"message": "Notification marked as read", "notification": notification.to_dict()})
         else:
@@ -55,6 +171,7 @@ def dismiss_notification(notification_id):
         
         if notification:
             session.delete(notification)
+            record_change(session, ChangeLog.NOTIFICATION, notification_id, ChangeLog.DELETE)
             session.commit()
             return jsonify({"message": "Notification dismissed successfully"})
         else:
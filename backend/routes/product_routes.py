@@ -1,7 +1,9 @@
+import math
 from flask import Blueprint, jsonify, request
 from datetime import datetime
-from models import Product, MaintenanceRecommendation, Session
-from utils import calculate_predictions
+from models import Product, MaintenanceRecommendation, Session, ChangeLog, entity_version, get_engine
+from utils import calculate_predictions, prediction_input, start_of_day
+from scoring import get_model, prediction_cache, DEFAULT_MODEL
 
 product_bp = Blueprint('product_routes', __name__)
 
@@ -47,25 +49,55 @@ def get_recommendations(product_id):
 @product_bp.route('/predict/<product_id>', methods=['GET'])
 def predict_maintenance(product_id):
     """Predict maintenance needs based on product data"""
-    session = Session()
-    product = session.query(Product).filter(Product.id == product_id).first()
+    try:
+        seed = int(request.args['seed']) if 'seed' in request.args else None
+    except ValueError:
+        return jsonify({"error": "seed must be an integer"}), 400
     
-    if not product:
-        session.close()
-        return jsonify({"error": "Product not found"}), 404
+    try:
+        variability = float(request.args.get('variability', 0.0))
+    except ValueError:
+        variability = None
+    if variability is None or not math.isfinite(variability) or variability < 0:
+        return jsonify({"error": "variability must be a finite number >= 0"}), 400
     
-    # Get recommendations for this product type
-    product_type = product.type
-    recommendations = session.query(MaintenanceRecommendation).filter(
-        MaintenanceRecommendation.product_type == product_type
-    ).all()
+    try:
+        model = get_model(
+            request.args.get('model', DEFAULT_MODEL),
+            seed=seed,
+            variability=variability
+        )
+    except KeyError:
+        return jsonify({"error": "Unknown scoring model"}), 400
     
-    # Convert product and recommendations to dicts for the prediction function
-    product_dict = product.to_dict()
-    recommendation_dicts = [rec.to_dict() for rec in recommendations]
+    # Predictions are stable for a day unless the product changes. The product's
+    # change log version covers its own updates, and resets cover replaced
+    # recommendations, so a cache hit costs one indexed lookup on a plain
+    # connection and no ORM work.
+    as_of = start_of_day()
+    with get_engine().connect() as connection:
+        version = entity_version(connection, ChangeLog.PRODUCT, product_id)
+    cache_key = (product_id, version, model.cache_key(), as_of)
+    predictions = prediction_cache.get(cache_key)
     
-    # Calculate maintenance predictions
-    predictions = calculate_predictions(product_dict, recommendation_dicts)
-    session.close()
+    if predictions is None:
+        session = Session()
+        product = session.query(Product).filter(Product.id == product_id).first()
+        
+        if not product:
+            session.close()
+            return jsonify({"error": "Product not found"}), 404
+        
+        # Get recommendations for this product type
+        product_type = product.type
+        recommendations = session.query(MaintenanceRecommendation).filter(
+            MaintenanceRecommendation.product_type == product_type
+        ).order_by(MaintenanceRecommendation.id).all()
+        recommendation_dicts = [rec.to_dict() for rec in recommendations]
+        
+        # Calculate maintenance predictions
+        predictions = calculate_predictions(prediction_input(product), recommendation_dicts, model, as_of)
+        prediction_cache.put(cache_key, predictions)
+        session.close()
     
     return jsonify(predictions)
@@ -0,0 +1,107 @@
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from models import Session, Product, MaintenanceRecord, Notification, ChangeLog, current_token, BULK_CHUNK_SIZE
+
+sync_bp = Blueprint('sync_routes', __name__)
+
+# Synced collections and the relationships to eager load for the response.
+# Loader options are built per request: creating them at import time would
+# configure every mapper during worker startup.
+SYNCED_MODELS = {
+    ChangeLog.PRODUCT: (Product, ('owner', 'installer', 'maintenance_history')),
+    ChangeLog.MAINTENANCE_RECORD: (MaintenanceRecord, ()),
+    ChangeLog.NOTIFICATION: (Notification, ('recipients',)),
+}
+
+def needs_full_resync(session, since, token):
+    """A token needs a full resync if it is unknown, compacted away or predates a reset"""
+    if since > token:
+        return True
+    
+    oldest = session.query(func.min(ChangeLog.id)).scalar()
+    if oldest is not None and since < oldest - 1:
+        return True
+    
+    reset = session.query(ChangeLog.id).filter(
+        ChangeLog.id > since,
+        ChangeLog.id <= token,
+        ChangeLog.op == ChangeLog.RESET
+    ).first()
+    return reset is not None
+
+def load_rows(session, entity, ids=None):
+    model, relationships = SYNCED_MODELS[entity]
+    options = [selectinload(getattr(model, name)) for name in relationships]
+    if ids is None:
+        return session.query(model).options(*options).all()
+    
+    rows = []
+    ids = list(ids)
+    for start in range(0, len(ids), BULK_CHUNK_SIZE):
+        chunk = ids[start:start + BULK_CHUNK_SIZE]
+        rows.extend(session.query(model).options(*options).filter(model.id.in_(chunk)).all())
+    return rows
+
+@sync_bp.route('/sync', methods=['GET'])
+def sync():
+    """Return rows changed since the given token, or everything if a full resync is needed"""
+    session = Session()
+    since = request.args.get('since')
+    
+    try:
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                return jsonify({"error": "Invalid sync token"}), 400
+        
+        # Tokens are only safe where change log ids commit in order. SQLite
+        # serializes writers, so a transaction holding a lower id can never
+        # commit after one holding a higher id; other databases give no such
+        # guarantee and a client could skip a late commit forever.
+        if session.get_bind().dialect.name != 'sqlite':
+            return jsonify({"error": "Delta sync requires a SQLite database"}), 501
+        
+        # Read the token first: rows changed afterwards may be sent twice, but never missed
+        token = current_token(session)
+        full = since is None or needs_full_resync(session, since, token)
+        
+        result = {"token": str(token), "full": full}
+        
+        if full:
+            for entity in SYNCED_MODELS:
+                result[entity] = {
+                    "upserted": [row.to_dict() for row in load_rows(session, entity)],
+                    "deleted": []
+                }
+            return jsonify(result)
+        
+        # Keep only the latest operation per entity
+        latest = {entity: {} for entity in SYNCED_MODELS}
+        entries = session.query(ChangeLog.entity, ChangeLog.entity_id, ChangeLog.op).filter(
+            ChangeLog.id > since,
+            ChangeLog.id <= token
+        ).order_by(ChangeLog.id)
+        for entity, entity_id, op in entries:
+            if entity in latest:
+                latest[entity][entity_id] = op
+        
+        for entity, ops in latest.items():
+            upsert_ids = {entity_id for entity_id, op in ops.items() if op == ChangeLog.UPSERT}
+            rows = load_rows(session, entity, upsert_ids)
+            found = {row.id for row in rows}
+            deleted = [entity_id for entity_id, op in ops.items() if op == ChangeLog.DELETE]
+            # Rows logged as upserted but gone by now were deleted after the token
+            deleted.extend(upsert_ids - found)
+            result[entity] = {
+                "upserted": [row.to_dict() for row in rows],
+                "deleted": deleted
+            }
+        
+        return jsonify(result)
+    except Exception:
+        current_app.logger.exception("Sync failed")
+        return jsonify({"error": "Failed to load changes"}), 500
+    finally:
+        session.close()
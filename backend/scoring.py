@@ -0,0 +1,141 @@
+
+import random
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+
+DEFAULT_MODEL = 'baseline'
+DEFAULT_CACHE_SIZE = 1024
+
+class ScoringModel(ABC):
+    """
+    Interface for health scoring models.
+
+    ``score`` returns the efficiency and reliability impacts (zero or negative)
+    that calculate_predictions applies to each component's health score.
+    Bump ``version`` whenever the output for the same input changes, so
+    cached predictions from the old version are not served.
+    """
+    name = None
+    version = None
+
+    def cache_key(self):
+        return (self.name, self.version)
+
+    @abstractmethod
+    def score(self, product, as_of):
+        pass
+
+class BaselineModel(ScoringModel):
+    """
+    Deterministic model derived from performance metrics, hours run and service age.
+
+    With a ``seed`` and non-zero ``variability`` each impact gets a jitter of up
+    to ``variability`` points, drawn from a generator seeded per product so the
+    same inputs always give the same output.
+    """
+    name = 'baseline'
+    version = 1
+
+    MAX_EFFICIENCY_PENALTY = 5
+    MAX_RELIABILITY_PENALTY = 8
+
+    def __init__(self, seed=None, variability=0.0):
+        self.seed = seed
+        self.variability = variability
+
+    def cache_key(self):
+        return (self.name, self.version, self.seed, self.variability)
+
+    def score(self, product, as_of):
+        metrics = product.get('performanceMetrics') or {}
+        efficiency = metrics.get('efficiency', 100)
+        reliability = metrics.get('reliability', 100)
+        hours_run = product['totalHoursRun']
+
+        serviced = product.get('lastServiceDate') or product['installDate']
+        if isinstance(serviced, str):
+            serviced = datetime.fromisoformat(serviced)
+        service_age_days = max(0, (as_of - serviced).days)
+
+        efficiency_penalty = (100 - efficiency) * 0.1 + min(hours_run, 500) / 250
+        reliability_penalty = (100 - reliability) * 0.1 + min(service_age_days, 730) / 146
+
+        if self.seed is not None and self.variability:
+            rng = random.Random(f"{self.seed}:{product.get('id')}")
+            efficiency_penalty += rng.uniform(-self.variability, self.variability)
+            reliability_penalty += rng.uniform(-self.variability, self.variability)
+
+        return {
+            'efficiency': -round(min(max(efficiency_penalty, 0), self.MAX_EFFICIENCY_PENALTY), 1),
+            'reliability': -round(min(max(reliability_penalty, 0), self.MAX_RELIABILITY_PENALTY), 1)
+        }
+
+MODELS = {
+    BaselineModel.name: BaselineModel,
+}
+
+def get_model(name=DEFAULT_MODEL, **params):
+    """Instantiate a registered scoring model; raises KeyError for unknown names"""
+    return MODELS[name](**params)
+
+class PredictionCache:
+    """Thread-safe LRU cache for prediction results with hit/miss/eviction counters"""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = self._check_maxsize(maxsize)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize):
+        maxsize = self._check_maxsize(maxsize)
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    @staticmethod
+    def _check_maxsize(maxsize):
+        if isinstance(maxsize, bool) or not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError(f"Prediction cache size must be a non-negative integer, got {maxsize!r}")
+        return maxsize
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+# Per-process cache used by the predict endpoint
+prediction_cache = PredictionCache()
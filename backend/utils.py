@@ -1,7 +1,7 @@
 
 from datetime import datetime, timedelta
-import random
 import json
+from scoring import get_model
 
 def format_datetime(obj):
     """Convert datetime objects to ISO format strings"""
@@ -9,17 +9,35 @@ def format_datetime(obj):
         return obj.isoformat()
     return obj
 
-def calculate_health_status(product, hours_remaining):
+def start_of_day(moment=None):
+    """Truncate a datetime (default: now) to midnight so predictions are stable within a day"""
+    moment = moment or datetime.now()
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def prediction_input(product):
+    """The subset of Product.to_dict() that calculate_predictions reads, without lazy loads"""
+    return {
+        'id': product.id,
+        'name': product.name,
+        'installDate': product.install_date,
+        'lastServiceDate': product.last_service_date,
+        'totalHoursRun': product.total_hours_run,
+        'performanceMetrics': json.loads(product.performance_metrics) if product.performance_metrics else {}
+    }
+
+def calculate_health_status(product, hours_remaining, as_of=None):
     """Calculate health status based on multiple factors"""
+    as_of = as_of or datetime.now()
+    
     # Get days since installation
     install_date = datetime.fromisoformat(product['installDate']) if isinstance(product['installDate'], str) else product['installDate']
-    days_since_install = (datetime.now() - install_date).days
+    days_since_install = (as_of - install_date).days
     
     # Get days since last service
     last_service_date = None
     if product.get('lastServiceDate'):
         last_service_date = datetime.fromisoformat(product['lastServiceDate']) if isinstance(product['lastServiceDate'], str) else product['lastServiceDate']
-        days_since_service = (datetime.now() - last_service_date).days
+        days_since_service = (as_of - last_service_date).days
     else:
         days_since_service = days_since_install
     
@@ -31,13 +49,20 @@ def calculate_health_status(product, hours_remaining):
     else:
         return "Healthy"
 
-def calculate_predictions(product, recommendations):
+def calculate_predictions(product, recommendations, model=None, as_of=None):
     """
     Calculate predictive maintenance information based on:
     - Usage patterns
     - Hours run
     - Manufacturer recommendations
+    
+    Health scores come from ``model`` (default: the baseline scoring model).
+    The result is deterministic for a given ``as_of``, which defaults to the
+    start of today.
     """
+    model = model or get_model()
+    as_of = as_of or start_of_day()
+    
     # Get routine maintenance recommendation
     routine_rec = next((r for r in recommendations if r['maintenanceType'] == 'Routine'), None)
     
@@ -56,10 +81,10 @@ def calculate_predictions(product, recommendations):
     
     # Calculate date of next maintenance
     # Assuming average usage of 1 hour per day
-    next_maintenance_date = datetime.now() + timedelta(days=hours_remaining)
+    next_maintenance_date = as_of + timedelta(days=hours_remaining)
     
     # Calculate health status
-    health_status = calculate_health_status(product, hours_remaining)
+    health_status = calculate_health_status(product, hours_remaining, as_of)
     
     # Generate warning message based on status
     warning_message = None
@@ -70,9 +95,9 @@ def calculate_predictions(product, recommendations):
     elif hours_remaining < 50:
         warning_message = f"NOTIFICATION: {product['name']} will need routine maintenance in {hours_remaining} hours."
     
-    # Add some randomness to predictions to simulate real-world variability
-    efficiency_impact = random.randint(-5, -1) if health_status != "Healthy" else random.randint(-2, 0)
-    reliability_impact = random.randint(-8, -3) if health_status == "Critical" else random.randint(-4, -1) if health_status == "Warning" else 0
+    impacts = model.score(product, as_of)
+    efficiency_impact = impacts['efficiency']
+    reliability_impact = impacts['reliability']
     
     return {
         "status": health_status,
@@ -82,19 +107,19 @@ def calculate_predictions(product, recommendations):
         "predictions": [
             {
                 "component": "Overall System",
-                "healthScore": 100 + efficiency_impact + reliability_impact,
+                "healthScore": round(100 + efficiency_impact + reliability_impact, 1),
                 "maintenanceRecommendation": "Schedule routine maintenance" if hours_remaining < 50 else "No immediate action needed",
                 "potentialIssues": ["Performance degradation", "Reduced efficiency"] if health_status != "Healthy" else []
             },
             {
                 "component": "Engine",
-                "healthScore": 100 + efficiency_impact * 1.5,
+                "healthScore": round(100 + efficiency_impact * 1.5, 1),
                 "maintenanceRecommendation": "Check oil levels and condition",
                 "potentialIssues": ["Oil degradation", "Combustion inefficiency"] if health_status != "Healthy" else []
             },
             {
                 "component": "Filter System",
-                "healthScore": 100 + reliability_impact * 1.2,
+                "healthScore": round(100 + reliability_impact * 1.2, 1),
                 "maintenanceRecommendation": "Inspect air filter" if hours_run > 50 else "No action needed",
                 "potentialIssues": ["Reduced airflow", "Increased fuel consumption"] if health_status != "Healthy" else []
             }